@@ -1 +0,0 @@
-../../ansible-ssh.py
\ No newline at end of file
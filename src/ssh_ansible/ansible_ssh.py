@@ -0,0 +1,1237 @@
+#!/usr/bin/env python3
+"""
+ansible-ssh: Connect to a host using connection variables from an Ansible inventory.
+
+Usage:
+    ansible-ssh -i <inventory_file> <host> [<host> ...] [--print-only]
+
+Requirements:
+    - ansible (for ansible-inventory)
+    - Python 3
+    - sshpass (if using password-based SSH)
+    - jq (for bash_completion script)
+    - tmux (for connecting to multiple hosts)
+"""
+
+import functools
+import os
+import sys
+
+# Other modules are imported where they are used, most runs (including the
+# bash completion) only need a fraction of them and every import adds startup time.
+
+ANSIBLE_CONFIG_LOCATIONS = [
+    lambda: os.environ.get("ANSIBLE_CONFIG"),
+    lambda: os.path.join(os.getcwd(), "ansible.cfg"),
+    lambda: os.path.expanduser("~/.ansible.cfg"),
+    lambda: "/etc/ansible/ansible.cfg",
+]
+
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "ansible-ssh")
+
+# Name the script was invoked as, used in the bash completion script
+BASENAME = os.path.basename(sys.argv[0])
+
+# Bash completion script, {basename} is replaced with BASENAME.
+# Provides tab completion for options, inventory files, and hostnames.
+# A pre-rendered copy is shipped in completion/ansible-ssh, regenerate it when changing this
+# (ansible-ssh -C bash > completion/ansible-ssh).
+BASH_COMPLETION_TEMPLATE = r"""#!/bin/bash
+# Bash completion script for {basename}
+
+# Load hostnames from the inventory file into the caller's hostlist array.
+# The list is cached per inventory path and reused while it is newer than the inventory,
+# a cache hit is served by bash builtins only, without forking any process.
+# Dynamic inventories (executable scripts, directories and inventory plugin configs) can change
+# without their mtime changing, like in ansible-ssh itself they are never cached.
+# Set ANSIBLE_SSH_NOCACHE to disable the cache, or ANSIBLE_SSH_INV_CACHE_TIMEOUT (seconds)
+# to also expire it after a while.
+_ansible_ssh_load_hosts() {
+    local inv_file="$1" cache_dir cache_file use_cache=1 line
+    [[ "$inv_file" == /* ]] || inv_file="$PWD/$inv_file"
+    inv_file="${inv_file//\/.\//\/}"
+    cache_dir="${XDG_CACHE_HOME:-$HOME/.cache}/ansible-ssh"
+    cache_file="hosts.${inv_file//\//%}"
+    # Long paths do not fit in a file name (255 bytes), hash them instead
+    if [ ${#cache_file} -gt 200 ]; then
+        cache_file=$(md5sum <<< "$inv_file")
+        cache_file="hosts.${cache_file%% *}"
+    fi
+    cache_file="$cache_dir/$cache_file"
+
+    if [ -n "$ANSIBLE_SSH_NOCACHE" ] || [ ! -f "$inv_file" ] || [ ! -r "$inv_file" ] || [ -x "$inv_file" ]; then
+        use_cache=
+    elif [[ "${inv_file,,}" == *.yml || "${inv_file,,}" == *.yaml ]]; then
+        while IFS= read -r line; do
+            [[ "$line" == plugin:* ]] && use_cache= && break
+        done < "$inv_file"
+    fi
+
+    if [ -n "$use_cache" ] && [ -s "$cache_file" ] && [ "$cache_file" -nt "$inv_file" ]; then
+        if [ -z "$ANSIBLE_SSH_INV_CACHE_TIMEOUT" ] || [ $(( $(date +%s) - $(stat -c %Y "$cache_file") )) -lt "$ANSIBLE_SSH_INV_CACHE_TIMEOUT" ]; then
+            mapfile -t hostlist < "$cache_file"
+            return 0
+        fi
+    fi
+
+    # Try to get hostnames from both ._meta.hostvars (YAML format) and from all groups (INI format)
+    mapfile -t hostlist < <(ansible-inventory -i "$inv_file" --list 2>/dev/null | jq -r '
+        (._meta.hostvars | keys[]) // empty,
+        (.[] | select(type == "object" and has("hosts")) | .hosts[]?) // empty
+    ' 2>/dev/null | sort -u)
+    [ ${#hostlist[@]} -eq 0 ] && return 1
+
+    # Only cache successful lookups, write atomically
+    if [ -n "$use_cache" ] && mkdir -p -m 700 "$cache_dir" 2>/dev/null; then
+        { printf '%s\n' "${hostlist[@]}" > "$cache_file.$$" && mv -f "$cache_file.$$" "$cache_file"; } 2>/dev/null
+    fi
+    return 0
+}
+
+# Add hostnames from the inventory file matching the current word to COMPREPLY
+_ansible_ssh_complete_hosts() {
+    local hostlist host
+    _ansible_ssh_load_hosts "$1" || return 0
+    for host in "${hostlist[@]}"; do
+        [[ "$host" == "$cur"* ]] && COMPREPLY+=( "$host" )
+    done
+    return 0
+}
+
+_ansible_ssh_completion() {
+    local cur prev inv_index inv_file debug_count options
+    COMPREPLY=()
+    cur="${COMP_WORDS[COMP_CWORD]}"
+    prev="${COMP_WORDS[COMP_CWORD-1]}"
+
+    # Available options at the top level
+    if [[ $COMP_CWORD -eq 1 ]]; then
+        # If current word starts with -, complete options
+        if [[ "$cur" == -* ]]; then
+            COMPREPLY=( $(compgen -W "-C --complete -h --help -i --inventory" -- "$cur") )
+            return 0
+        else
+            # Try to complete hosts from ansible.cfg inventory if available
+            _find_ansible_cfg_inventory() {
+                local cfg
+                local inv
+                if [ -n "$ANSIBLE_CONFIG" ] && [ -f "$ANSIBLE_CONFIG" ]; then
+                    cfg="$ANSIBLE_CONFIG"
+                elif [ -f "./ansible.cfg" ]; then
+                    cfg="./ansible.cfg"
+                elif [ -f "$HOME/.ansible.cfg" ]; then
+                    cfg="$HOME/.ansible.cfg"
+                elif [ -f "/etc/ansible/ansible.cfg" ]; then
+                    cfg="/etc/ansible/ansible.cfg"
+                fi
+                if [ -n "$cfg" ]; then
+                    inv=$(awk -F '=' '/^[[:space:]]*inventory[[:space:]]*=/ {gsub(/^[[:space:]]+|[[:space:]]+$/, "", $2); print $2; exit}' "$cfg")
+                    if [ -n "$inv" ] && [ -f "$inv" ]; then
+                        echo "$inv"
+                        return 0
+                    fi
+                fi
+                return 1
+            }
+            
+            local cfg_inv=$(_find_ansible_cfg_inventory)
+            if [ -n "$cfg_inv" ]; then
+                _ansible_ssh_complete_hosts "$cfg_inv"
+                return 0
+            fi
+            
+            # If no ansible.cfg inventory, complete options
+            COMPREPLY=( $(compgen -W "-C --complete -h --help -i --inventory" -- "$cur") )
+            return 0
+        fi
+    fi
+
+    # Stop completion if -h/--help is used
+    if [[ " ${COMP_WORDS[@]} " =~ " -h " || " ${COMP_WORDS[@]} " =~ " --help " ]]; then
+        return 0
+    fi
+
+    # If completing the -C/--complete flag, suggest only 'bash' and stop further completion
+    if [[ "${prev}" == "-C" || "${prev}" == "--complete" ]]; then
+        COMPREPLY=( $(compgen -W "bash" -- "$cur") )
+        return 0
+    fi
+
+    # Locate the inventory file argument by finding "-i" or "--inventory"
+    inv_index=-1
+    for i in "${!COMP_WORDS[@]}"; do
+        if [[ "${COMP_WORDS[i]}" == "-i" || "${COMP_WORDS[i]}" == "--inventory" ]]; then
+            inv_index=$((i+1))
+            break
+        fi
+    done
+
+    # If completing the inventory file argument, check for ansible.cfg in standard locations
+    if [ $COMP_CWORD -eq $inv_index ]; then
+        # Bash function to find ansible.cfg and extract inventory
+        _find_ansible_cfg_inventory() {
+            local cfg
+            local inv
+            # 1. ANSIBLE_CONFIG env
+            if [ -n "$ANSIBLE_CONFIG" ] && [ -f "$ANSIBLE_CONFIG" ]; then
+                cfg="$ANSIBLE_CONFIG"
+            elif [ -f "./ansible.cfg" ]; then
+                cfg="./ansible.cfg"
+            elif [ -f "$HOME/.ansible.cfg" ]; then
+                cfg="$HOME/.ansible.cfg"
+            elif [ -f "/etc/ansible/ansible.cfg" ]; then
+                cfg="/etc/ansible/ansible.cfg"
+            fi
+            if [ -n "$cfg" ]; then
+                inv=$(awk -F '=' '/^[[:space:]]*inventory[[:space:]]*=/ {gsub(/^[[:space:]]+|[[:space:]]+$/, "", $2); print $2; exit}' "$cfg")
+                if [ -n "$inv" ]; then
+                    echo "$inv"
+                    return 0
+                fi
+            fi
+            return 1
+        }
+        
+        local inv_path=$(_find_ansible_cfg_inventory)
+            
+        # If we found an inventory in ansible.cfg and no input yet, suggest only that
+        if [ -n "$inv_path" ] && [ -z "$cur" ]; then
+            COMPREPLY=( "$inv_path" )
+            return 0
+        fi
+        
+        # If there's partial input, do normal file completion but prioritize config inventory
+        local completions=()
+        
+        # Add config inventory first if it matches the current input
+        if [ -n "$inv_path" ] && [[ "$inv_path" == "$cur"* ]]; then
+            completions+=( "$inv_path" )
+        fi
+        
+        # Add file completion for other inventory files, but avoid duplicates
+        compopt -o nospace
+        local IFS=$'\n'
+        local files=( $(compgen -f -- "$cur") )
+        for file in "${files[@]}"; do
+            # Skip if this file is already in completions (avoid duplicates)
+            local skip=false
+            for existing in "${completions[@]}"; do
+                # Compare canonical paths to avoid ./file vs file duplicates
+                local canonical_file canonical_existing
+                canonical_file=$(readlink -f "$file" 2>/dev/null || echo "$file")
+                canonical_existing=$(readlink -f "$existing" 2>/dev/null || echo "$existing")
+                if [ "$canonical_file" = "$canonical_existing" ]; then
+                    skip=true
+                    break
+                fi
+            done
+            
+            if [ "$skip" = false ]; then
+                if [ -d "$file" ]; then
+                    completions+=( "${file}/" )
+                else
+                    completions+=( "$file " )
+                fi
+            fi
+        done
+        
+        COMPREPLY=( "${completions[@]}" )
+        return 0
+    fi
+
+    # Complete hostnames from the provided inventory if it exists
+    if [ $inv_index -ne -1 ] && [[ -f "${COMP_WORDS[$inv_index]}" ]]; then
+        inv_file="${COMP_WORDS[$inv_index]}"
+    else
+        # If no explicit inventory provided, try to find one from ansible.cfg
+        _find_ansible_cfg_inventory() {
+            local cfg
+            local inv
+            if [ -n "$ANSIBLE_CONFIG" ] && [ -f "$ANSIBLE_CONFIG" ]; then
+                cfg="$ANSIBLE_CONFIG"
+            elif [ -f "./ansible.cfg" ]; then
+                cfg="./ansible.cfg"
+            elif [ -f "$HOME/.ansible.cfg" ]; then
+                cfg="$HOME/.ansible.cfg"
+            elif [ -f "/etc/ansible/ansible.cfg" ]; then
+                cfg="/etc/ansible/ansible.cfg"
+            fi
+            if [ -n "$cfg" ]; then
+                inv=$(awk -F '=' '/^[[:space:]]*inventory[[:space:]]*=/ {gsub(/^[[:space:]]+|[[:space:]]+$/, "", $2); print $2; exit}' "$cfg")
+                if [ -n "$inv" ] && [ -f "$inv" ]; then
+                    echo "$inv"
+                    return 0
+                fi
+            fi
+            return 1
+        }
+        
+        inv_file=$(_find_ansible_cfg_inventory)
+        if [ -z "$inv_file" ]; then
+            return 0
+        fi
+    fi
+
+    # If host has been selected from the inventory, suggest additional argument completions
+    # and more hosts (multiple hosts are opened in tmux panes).
+    if [ $COMP_CWORD -ge $((inv_index+2)) ] || ([ $inv_index -eq -1 ] && [ $COMP_CWORD -ge 2 ]); then
+        # Count the number of --debug and --print-only occurrences
+        # Allow 3 --debug occurrences and 1 --print-only
+        debug_count=0
+        print_only_count=0
+        for word in "${COMP_WORDS[@]}"; do
+            if [ "$word" == "--debug" ]; then
+                debug_count=$((debug_count+1))
+            fi
+            if [ "$word" == "--print-only" ]; then
+                print_only_count=$((print_only_count+1))
+            fi
+        done
+        options=""
+        if [ $print_only_count -eq 0 ]; then
+            options="--print-only"
+        fi
+        if [ $debug_count -lt 3 ]; then
+            if [ -z "$options" ]; then
+                options="--debug"
+            else
+                options="$options --debug"
+            fi
+        fi
+        COMPREPLY=( $(compgen -W "$options" -- "$cur") )
+        if [[ "$cur" != -* ]]; then
+            _ansible_ssh_complete_hosts "$inv_file"
+        fi
+        return 0
+    fi
+
+    # Complete hostnames from the inventory
+    if [ -n "$inv_file" ] && [ -f "$inv_file" ]; then
+        _ansible_ssh_complete_hosts "$inv_file"
+    fi
+}
+
+complete -F _ansible_ssh_completion {basename}
+"""
+
+# Rendered once at import. A plain replace is used, string.Template/str.format
+# would clash with the $ and {} bash syntax all over the script.
+BASH_COMPLETION_SCRIPT = BASH_COMPLETION_TEMPLATE.replace("{basename}", BASENAME).encode()
+
+def print_bash_completion_script():
+    """
+    Print a bash completion script for ansible-ssh.
+    """
+    sys.stdout.buffer.write(BASH_COMPLETION_SCRIPT)
+    sys.stdout.buffer.flush()
+
+
+@functools.lru_cache(maxsize=None)
+def which(command):
+    """
+    Resolve a command to its full path using $PATH, memoized for the process lifetime.
+
+    Args:
+        command (str): Command name.
+
+    Returns:
+        str or None: Full path to the command, or None if it is not found.
+    """
+    import shutil
+
+    return shutil.which(command)
+
+def find_ansible_cfg():
+    """
+    Find ansible.cfg in the standard locations.
+    Returns the path if found, else None.
+    """
+    for loc in ANSIBLE_CONFIG_LOCATIONS:
+        path = loc()
+        if path and os.path.isfile(path):
+            return path
+    return None
+
+def get_default_inventory_from_cfg(cfg_path):
+    """
+    Parse ansible.cfg and return the default inventory file if set.
+    """
+    import configparser
+
+    parser = configparser.ConfigParser()
+    parser.read(cfg_path)
+    if parser.has_section("defaults") and parser.has_option("defaults", "inventory"):
+        return parser.get("defaults", "inventory")
+    return None
+
+def parse_arguments():
+    """
+    Parse command-line arguments for ansible-ssh.
+
+    Returns:
+        argparse.Namespace: Parsed arguments with inventory file, hosts, and optional flags.
+        The optional flags include:
+            - --complete: Print bash completion script.
+            - --print-only: Print SSH command instead of executing it.
+            - --debug: Increase verbosity (can be used up to 3 times).
+    
+    Raises:
+        SystemExit: If required arguments are missing.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=BASENAME,
+        usage="%(prog)s [-h] [-C {bash}] [-i INVENTORY] [host ...] [--print-only] [--debug]",
+        description="Connect to a host using connection variables from an Ansible inventory.",
+        epilog="EXAMPLES:\n"
+               "  Connect to a host:\n\t %(prog)s -i inventory myhost\n\n"
+               "  Connect to a host with ssh verbosity:\n\t %(prog)s -i inventory myhost --debug --debug\n\n"
+               "  Print SSH command:\n\t %(prog)s -i inventory myhost --print-only\n\n"
+               "  Connect to multiple hosts (in tmux panes):\n\t %(prog)s -i inventory myhost1 myhost2\n\n"
+               "  Generate and install bash completion script:\n\t %(prog)s -C bash | sudo tee /etc/bash_completion.d/%(prog)s",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("-C", "--complete", choices=["bash"], help="Print bash completion script and exit")
+    parser.add_argument("-i", "--inventory", help="Path to the Ansible inventory file")
+    parser.add_argument("--print-only", action="store_true", help="Print SSH command instead of executing it")
+    parser.add_argument("--debug", action="count", default=0, help="Increase verbosity (can be used up to 3 times)")
+    parser.add_argument("hosts", nargs="*", metavar="host", help="Host(s) to connect to, multiple hosts are opened in tmux panes")
+    args = parser.parse_intermixed_args()
+
+    # If inventory is not provided, try to get it from ansible.cfg
+    if not args.inventory and not args.complete:
+        cfg_path = find_ansible_cfg()
+        if cfg_path:
+            inv = get_default_inventory_from_cfg(cfg_path)
+            if inv:
+                args.inventory = inv
+
+    if not args.complete and (not args.inventory or not args.hosts):
+        parser.error("the following arguments are required: -i/--inventory (or ansible.cfg must exist in one of the standard locations), host")
+    return args
+
+def get_vars_dirs(inventory_file):
+    """
+    Return the group_vars/host_vars directories Ansible loads for an inventory.
+
+    Ansible reads them both next to the inventory and from the current directory.
+
+    Args:
+        inventory_file (str): Path to the Ansible inventory file.
+
+    Returns:
+        list: Absolute paths of the existing directories.
+    """
+    base_dirs = [os.path.dirname(os.path.abspath(inventory_file)), os.getcwd()]
+    vars_dirs = []
+    for base_dir in dict.fromkeys(base_dirs):
+        for name in ("group_vars", "host_vars"):
+            path = os.path.join(base_dir, name)
+            if os.path.isdir(path):
+                vars_dirs.append(path)
+    return vars_dirs
+
+def is_inventory_plugin_config(inventory_file):
+    """
+    Check whether a YAML inventory is an inventory plugin config (e.g. aws_ec2.yml).
+
+    Such inventories are dynamic, their content does not change when the hosts do.
+    """
+    if os.path.splitext(inventory_file)[1].lower() not in (".yml", ".yaml"):
+        return False
+    try:
+        with open(inventory_file, encoding="utf-8", errors="replace") as f:
+            return any(line.startswith("plugin:") for line in f)
+    except OSError:
+        return True
+
+def get_cache_files(inventory_file, hosts, inventory_stat=None):
+    """
+    Return the paths of the host variables cache files for several hosts.
+
+    Each file name is made of a key for the inventory path and host name, and a key for
+    the state of the sources the variables come from: the inventory file and all files
+    in the group_vars/host_vars directories Ansible loads (see get_vars_dirs), with their
+    modification times. Changing any of them invalidates the cache.
+    The state key is the same for all hosts, the sources are only checked once.
+
+    Dynamic sources (executable inventory scripts, inventory directories and
+    inventory plugin configs) can change without any file changing, they are not cached.
+
+    Args:
+        inventory_file (str): Path to the Ansible inventory file.
+        hosts (list): Host names.
+        inventory_stat (os.stat_result, optional): Result of os.stat() of the inventory
+            file, if the caller already has it.
+
+    Returns:
+        dict: Cache file paths keyed by host name. Empty if caching is disabled
+        (ANSIBLE_SSH_NOCACHE), the inventory is dynamic or cannot be stat'ed.
+    """
+    import hashlib
+    import stat
+
+    if os.environ.get("ANSIBLE_SSH_NOCACHE"):
+        return {}
+    try:
+        if inventory_stat is None:
+            inventory_stat = os.stat(inventory_file)
+        if not stat.S_ISREG(inventory_stat.st_mode) or inventory_stat.st_mode & 0o111:
+            return {}
+        if is_inventory_plugin_config(inventory_file):
+            return {}
+
+        state = [f"{os.path.abspath(inventory_file)}:{inventory_stat.st_mtime_ns}"]
+        for vars_dir in get_vars_dirs(inventory_file):
+            for root, dirs, files in os.walk(vars_dir):
+                dirs.sort()
+                for name in [root] + sorted(os.path.join(root, f) for f in files):
+                    state.append(f"{name}:{os.stat(name).st_mtime_ns}")
+    except OSError:
+        return {}
+
+    state_key = hashlib.sha1("\0".join(state).encode()).hexdigest()
+    cache_files = {}
+    for host in hosts:
+        host_key = hashlib.sha1(f"{os.path.abspath(inventory_file)}\0{host}".encode()).hexdigest()
+        cache_files[host] = os.path.join(CACHE_DIR, f"{host_key}.{state_key}.json")
+    return cache_files
+
+def load_json(data):
+    """
+    Parse JSON from bytes, using orjson if it is installed (much faster on large inventories).
+
+    Args:
+        data (bytes): Raw JSON document.
+
+    Returns:
+        Parsed JSON value.
+
+    Raises:
+        ValueError: If data is not valid JSON (both json and orjson errors are ValueError subclasses).
+    """
+    try:
+        import orjson
+    except ImportError:
+        import json
+        return json.loads(data)
+    return orjson.loads(data)
+
+def read_cache(cache_file):
+    """
+    Read cached host variables.
+
+    Returns:
+        dict or None: Cached host variables, or None on a cache miss or unreadable cache.
+    """
+    try:
+        with open(cache_file, "rb") as f:
+            data = load_json(f.read())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+def write_cache(cache_file, host_vars):
+    """
+    Atomically write host variables to the cache file.
+
+    The file may contain secrets (e.g. ansible_password), so the cache directory
+    is created with 0700 and the file with 0600 permissions. Errors are ignored,
+    caching is best effort only.
+    """
+    import json
+    import tempfile
+
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(host_vars, f)
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        # Remove outdated entries of the same inventory and host
+        host_key = os.path.basename(cache_file).split(".", 1)[0]
+        for entry in os.scandir(CACHE_DIR):
+            if entry.name.startswith(f"{host_key}.") and entry.name.endswith(".json") and entry.path != cache_file:
+                os.unlink(entry.path)
+    except (OSError, TypeError, ValueError):
+        pass
+
+def get_host_vars_from_ini(inventory_file, hosts):
+    """
+    Retrieve host variables of several hosts by parsing a simple static INI inventory in-process.
+
+    Handles host lines with key=value variables, [group:vars] and [group:children]
+    sections with the same precedence as Ansible (all < parent groups < child groups < host).
+    Anything this parser does not understand makes it give up and lets the caller
+    fall back to Ansible. Settings outside the inventory file that change host vars
+    (e.g. enabled vars plugins other than host_group_vars) are not taken into account.
+
+    Args:
+        inventory_file (str): Path to the Ansible inventory file.
+        hosts (list): Host names.
+
+    Returns:
+        dict or None: Host variables keyed by host name, hosts not defined in the inventory
+        are left out. None if the inventory is not a simple INI file or uses unsupported
+        features (host ranges, ports, group_vars/host_vars, ...).
+    """
+    import ast
+    import re
+    import shlex
+
+    if not os.path.isfile(inventory_file) or os.access(inventory_file, os.X_OK):
+        return None
+    if os.path.splitext(inventory_file)[1].lower() in (".yml", ".yaml", ".json", ".toml"):
+        return None
+    # group_vars/host_vars next to the inventory or in the current directory
+    # (playbook dir) are loaded by Ansible vars plugins
+    if get_vars_dirs(inventory_file):
+        return None
+
+    def parse_value(value):
+        # Same conversion as the Ansible INI inventory plugin
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            return value
+
+    section_re = re.compile(r"^\[(\w+)(?::(\w+))?\]\s*(?:#.*)?$")
+    hosts = set(hosts)
+    group, state = "ungrouped", "hosts"
+    host_vars = {}
+    host_groups = {}
+    group_vars = {}
+    parents = {}
+
+    try:
+        with open(inventory_file, encoding="utf-8") as f:
+            lines = [line.strip() for line in f]
+        first = next((line for line in lines if line and line[0] not in "#;"), "")
+        if not first.startswith("["):
+            return None
+
+        for line in lines:
+            if not line or line[0] in "#;":
+                continue
+            if line.startswith("["):
+                m = section_re.match(line)
+                if not m or (m.group(2) or "hosts") not in ("hosts", "vars", "children"):
+                    return None
+                group, state = m.group(1), m.group(2) or "hosts"
+                group_vars.setdefault(group, {})
+                continue
+
+            if state == "hosts":
+                tokens = shlex.split(line, comments=True)
+                if not tokens:
+                    continue
+                # Host ranges and host:port definitions are left to Ansible
+                if any(c in tokens[0] for c in "[]:"):
+                    return None
+                if tokens[0] not in hosts:
+                    continue
+                if any("=" not in t for t in tokens[1:]):
+                    return None
+                host_groups.setdefault(tokens[0], {"all"}).add(group)
+                host_vars.setdefault(tokens[0], {}).update(
+                    (k, parse_value(v)) for k, v in (t.split("=", 1) for t in tokens[1:])
+                )
+            elif state == "vars":
+                if "=" not in line:
+                    return None
+                k, v = [e.strip() for e in line.split("=", 1)]
+                group_vars[group][k] = parse_value(v)
+            else:
+                m = re.match(r"^(\w+)\s*(?:#.*)?$", line)
+                if not m:
+                    return None
+                parents.setdefault(m.group(1), set()).add(group)
+                group_vars.setdefault(m.group(1), {})
+    except (OSError, ValueError):
+        return None
+
+    def depth(name, seen=()):
+        if name == "all":
+            return 0
+        if name in seen:
+            raise RecursionError(f"group cycle at {name}")
+        return 1 + max((depth(p, seen + (name,)) for p in parents.get(name, ("all",))), default=0)
+
+    all_host_vars = {}
+    for host, groups in host_groups.items():
+        if groups == {"all"}:
+            groups.add("ungrouped")
+
+        # Add all ancestors of the host's groups
+        pending = list(groups)
+        while pending:
+            for parent in parents.get(pending.pop(), ()):
+                if parent not in groups:
+                    groups.add(parent)
+                    pending.append(parent)
+
+        try:
+            ordered_groups = sorted(groups, key=lambda g: (depth(g), g))
+        except RecursionError:
+            return None
+
+        merged = {}
+        for name in ordered_groups:
+            # Group priorities are not handled here
+            if "ansible_group_priority" in group_vars.get(name, {}):
+                return None
+            merged.update(group_vars.get(name, {}))
+        merged.update(host_vars[host])
+        all_host_vars[host] = merged
+    return all_host_vars
+
+def exit_host_not_found(inventory_file, hosts):
+    """
+    Print an error for each host missing from the inventory and exit.
+
+    Raises:
+        SystemExit: Always.
+    """
+    for host in hosts:
+        print(f"Error: Host '{host}' not found in inventory '{inventory_file}'.", file=sys.stderr)
+    sys.exit(1)
+
+def get_host_vars_from_api(inventory_file, hosts):
+    """
+    Retrieve host variables in-process using the Ansible Python API.
+
+    This avoids spawning ansible-inventory (and a second Python interpreter),
+    the variables are the same as reported by `ansible-inventory --host`.
+    The inventory is loaded only once for all hosts.
+
+    Args:
+        inventory_file (str): Path to the Ansible inventory file.
+        hosts (list): Host names.
+
+    Returns:
+        dict or None: Host variables keyed by host name, or None if the Ansible API
+        is not available, fails or returns vault encrypted values
+        (callers should fall back to ansible-inventory).
+
+    Raises:
+        SystemExit: If a host is not found in the inventory.
+    """
+    try:
+        from ansible import constants as C
+        from ansible.inventory.manager import InventoryManager
+        from ansible.parsing.dataloader import DataLoader
+        from ansible.vars.manager import VariableManager
+    except ImportError:
+        return None
+
+    def is_plain(value):
+        # Vault encrypted values are not plain data, and cannot be decrypted here
+        # without the vault secrets ansible-inventory sets up from its configuration
+        if isinstance(value, dict):
+            return all(is_plain(k) and is_plain(v) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return all(is_plain(v) for v in value)
+        return value is None or isinstance(value, (str, int, float, bool))
+
+    try:
+        loader = DataLoader()
+        inventory = InventoryManager(loader=loader, sources=[inventory_file])
+        # get_host() also returns the implicit localhost, which is not part of the inventory
+        inventory_hosts = {host: inventory.get_host(host) for host in hosts}
+        missing = [
+            host for host, inventory_host in inventory_hosts.items()
+            if inventory_host is None or getattr(inventory_host, "implicit", False)
+        ]
+        if missing:
+            exit_host_not_found(inventory_file, missing)
+        variable_manager = VariableManager(loader=loader, inventory=inventory)
+        all_host_vars = {
+            host: variable_manager.get_vars(host=inventory_host, include_hostvars=False, stage="all")
+            for host, inventory_host in inventory_hosts.items()
+        }
+
+        # Drop magic/internal variables, same as ansible-inventory does
+        internal = getattr(C, "INTERNAL_STATIC_VARS", ())
+        all_host_vars = {
+            host: {k: v for k, v in host_vars.items() if k not in internal}
+            for host, host_vars in all_host_vars.items()
+        }
+        if not is_plain(all_host_vars):
+            return None
+    except Exception:
+        return None
+
+    return all_host_vars
+
+def stream_host_vars_from_cli(inventory_file, hosts):
+    """
+    Retrieve host variables by streaming `ansible-inventory --list` output through ijson.
+
+    Only the requested hosts' variables are built in memory, and ansible-inventory
+    is stopped as soon as all of them have been read.
+
+    Args:
+        inventory_file (str): Path to the Ansible inventory file.
+        hosts (list): Host names.
+
+    Returns:
+        dict: Host variables keyed by host name. Hosts without variables get an empty dict.
+
+    Raises:
+        ImportError: If ijson is not installed (before running ansible-inventory).
+        SystemExit: If ansible-inventory command fails, a host is not found, or produces invalid JSON.
+    """
+    import ijson
+    import subprocess
+    import tempfile
+
+    remaining = set(hosts)
+    all_host_vars = {}
+    builder = None
+    current_host = None
+    hosts_in_group = set()
+    parse_error = None
+
+    # stderr goes to a temporary file, a pipe could fill up and block ansible-inventory
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            ["ansible-inventory", "-i", inventory_file, "--list"],
+            stdout=subprocess.PIPE,
+            stderr=stderr
+        )
+        try:
+            for prefix, event, value in ijson.parse(proc.stdout, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == f"_meta.hostvars.{current_host}" and event == "end_map":
+                        all_host_vars[current_host] = builder.value
+                        remaining.discard(current_host)
+                        builder = current_host = None
+                        if not remaining:
+                            break
+                elif current_host is not None and event == "start_map":
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                elif prefix == "_meta.hostvars" and event == "map_key" and value in remaining:
+                    current_host = value
+                elif value in remaining and not prefix.startswith("_meta") and (
+                    (event == "string" and prefix.endswith(".hosts.item"))
+                    or (event == "map_key" and prefix.endswith(".hosts"))
+                ):
+                    # Hosts without any variables only show up in the groups' hosts arrays
+                    hosts_in_group.add(value)
+        except ijson.JSONError as e:
+            parse_error = e
+        finally:
+            proc.stdout.close()
+            finished_early = proc.poll() is None
+            if finished_early:
+                proc.terminate()
+            proc.wait()
+
+        if proc.returncode and not (finished_early and not remaining):
+            stderr.seek(0)
+            print(f"Error running ansible-inventory --list:\n{stderr.read().decode(errors='replace')}", file=sys.stderr)
+            sys.exit(1)
+
+    if parse_error:
+        print(f"Error parsing JSON from ansible-inventory --list: {parse_error}", file=sys.stderr)
+        sys.exit(1)
+
+    missing = [host for host in hosts if host in remaining and host not in hosts_in_group]
+    if missing:
+        exit_host_not_found(inventory_file, missing)
+
+    return {host: all_host_vars.get(host, {}) for host in hosts}
+
+def get_host_vars_from_cli(inventory_file, hosts):
+    """
+    Retrieve host variables using a single `ansible-inventory --list` call.
+
+    Args:
+        inventory_file (str): Path to the Ansible inventory file.
+        hosts (list): Host names.
+
+    Returns:
+        dict: Host variables keyed by host name. Hosts without variables get an empty dict.
+
+    Raises:
+        SystemExit: If ansible-inventory command fails, a host is not found, or produces invalid JSON.
+    """
+    import subprocess
+
+    # Stream the output if ijson is available, only the requested hosts are kept in memory then
+    try:
+        return stream_host_vars_from_cli(inventory_file, hosts)
+    except ImportError:
+        pass
+
+    # Keep the output as bytes, load_json parses it without decoding to str first
+    try:
+        list_result = subprocess.run(
+            ["ansible-inventory", "-i", inventory_file, "--list"],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Error running ansible-inventory --list:\n{e.stderr.decode(errors='replace')}", file=sys.stderr)
+        sys.exit(1)
+    
+    try:
+        inventory_data = load_json(list_result.stdout)
+    except ValueError as e:
+        print(f"Error parsing JSON from ansible-inventory --list: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    # Hosts with variables are listed in _meta.hostvars (already merged with group vars)
+    hostvars = inventory_data.get("_meta", {}).get("hostvars", {})
+    all_host_vars = {host: hostvars[host] for host in hosts if host in hostvars}
+
+    # Hosts without any variables only show up in the groups' hosts arrays
+    for key, value in inventory_data.items():
+        if isinstance(value, dict) and "hosts" in value:
+            if isinstance(value["hosts"], (list, dict)):
+                for host in hosts:
+                    if host in value["hosts"]:
+                        all_host_vars.setdefault(host, {})
+    
+    missing = [host for host in hosts if host not in all_host_vars]
+    if missing:
+        exit_host_not_found(inventory_file, missing)
+
+    return all_host_vars
+
+def get_many_host_vars(inventory_file, hosts, inventory_stat=None):
+    """
+    Retrieve host variables of several hosts from the inventory.
+
+    Results are cached on disk (see get_cache_files). On a cache miss simple INI
+    inventories are parsed directly, anything else goes through the Ansible Python API
+    in-process, falling back to ansible-inventory if it is not available.
+    The inventory is loaded at most once, regardless of the number of hosts.
+
+    Args:
+        inventory_file (str): Path to the Ansible inventory file.
+        hosts (list): Host names.
+        inventory_stat (os.stat_result, optional): Result of os.stat() of the inventory
+            file, if the caller already has it.
+
+    Returns:
+        dict: Host variables keyed by host name. Hosts without variables get an empty dict.
+
+    Raises:
+        SystemExit: If ansible-inventory command fails, a host is not found, or produces invalid JSON.
+    """
+    all_host_vars = {}
+    cache_files = get_cache_files(inventory_file, hosts, inventory_stat)
+    for host, cache_file in list(cache_files.items()):
+        host_vars = read_cache(cache_file)
+        if host_vars is not None:
+            all_host_vars[host] = host_vars
+            del cache_files[host]
+
+    missing = [host for host in hosts if host not in all_host_vars]
+    if missing:
+        all_host_vars.update(get_host_vars_from_ini(inventory_file, missing) or {})
+        missing = [host for host in hosts if host not in all_host_vars]
+    if missing:
+        loaded = get_host_vars_from_api(inventory_file, missing)
+        if loaded is None:
+            loaded = get_host_vars_from_cli(inventory_file, missing)
+        all_host_vars.update(loaded)
+
+    # Cache the hosts which were not cached yet
+    for host, cache_file in cache_files.items():
+        write_cache(cache_file, all_host_vars[host])
+
+    return all_host_vars
+
+def get_host_vars(inventory_file, host):
+    """
+    Retrieve host variables from the inventory, see get_many_host_vars.
+
+    Args:
+        inventory_file (str): Path to the Ansible inventory file.
+        host (str): Host name.
+
+    Returns:
+        dict: Host variables. Returns empty dict if host exists but has no variables.
+
+    Raises:
+        SystemExit: If ansible-inventory command fails, host is not found, or produces invalid JSON.
+    """
+    # Return the host variables (may be empty dict if no variables defined)
+    return get_many_host_vars(inventory_file, [host])[host]
+
+@functools.lru_cache(maxsize=64)
+def split_ssh_args(args):
+    """
+    Split an SSH arguments string shell-style, memoized since hosts usually share the same args.
+
+    Args:
+        args (str): SSH arguments, e.g. from ansible_ssh_common_args.
+
+    Returns:
+        tuple: Arguments (a tuple, so the cached value cannot be modified by callers).
+
+    Raises:
+        ValueError: If the string cannot be parsed (e.g. unbalanced quotes).
+    """
+    import shlex
+
+    return tuple(shlex.split(args))
+
+def parse_extra_ssh_options(host_vars):
+    """
+    Parse extra SSH options from host variables.
+
+    Args:
+        host_vars (dict): Host variables from the inventory.
+
+    Returns:
+        list: Extra SSH options.
+    """
+    options = []
+    common_args = host_vars.get("ansible_ssh_common_args")
+    extra_args = host_vars.get("ansible_ssh_extra_args")
+    
+    if common_args:
+        try:
+            options.extend(split_ssh_args(common_args))
+        except Exception as e:
+            print(f"Error parsing ansible_ssh_common_args: {e}", file=sys.stderr)
+            sys.exit(1)
+    if extra_args:
+        try:
+            options.extend(split_ssh_args(extra_args))
+        except Exception as e:
+            print(f"Error parsing ansible_ssh_extra_args: {e}", file=sys.stderr)
+            sys.exit(1)
+    return options
+
+def build_ssh_command(host_vars, host):
+    # Extract variables with fallbacks
+    """
+    Build the SSH command and target from host variables.
+
+    Args:
+        host_vars (dict): Host variables from the inventory.
+        host (str): Host name.
+
+    Returns:
+        tuple: (ssh_cmd (list), ssh_pass (str or None), target (str))
+    """
+    # For host, check ansible_ssh_host then ansible_host, then fall back to the original host name
+    host_ip = host_vars.get("ansible_ssh_host") or host_vars.get("ansible_host") or host
+    # For user, check ansible_ssh_user then ansible_user.
+    user = host_vars.get("ansible_ssh_user") or host_vars.get("ansible_user")
+    port = host_vars.get("ansible_port")
+    key = host_vars.get("ansible_private_key_file")
+    # For password, check ansible_ssh_pass then ansible_password.
+    ssh_pass = host_vars.get("ansible_ssh_pass") or host_vars.get("ansible_password")
+    
+    # Build the base SSH command as a list
+    ssh_cmd = ["ssh"]
+
+    if port:
+        ssh_cmd.extend(["-p", str(port)])
+    if key:
+        ssh_cmd.extend(["-i", key])
+    
+    # Parse and add extra SSH options (ProxyJump, etc.)
+    extra_options = parse_extra_ssh_options(host_vars)
+    ssh_cmd.extend(extra_options)
+
+    # Reuse connections via ssh multiplexing unless disabled with ANSIBLE_SSH_NO_MUX.
+    # Added after the inventory options, ssh uses the first value, so the inventory wins.
+    if not os.environ.get("ANSIBLE_SSH_NO_MUX"):
+        # %C is a hash of the connection, %r@%h:%p easily exceeds the unix socket path limit
+        ssh_cmd.extend([
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPersist={os.environ.get('ANSIBLE_SSH_CONTROL_PERSIST', '60s')}",
+            "-o", f"ControlPath={os.path.join(os.path.expanduser('~/.ssh'), 'cm-%C')}",
+        ])
+    
+    # Build the target string
+    if user:
+        target = f"{user}@{host_ip}"
+    else:
+        target = host_ip
+
+    ssh_cmd.append(target)
+
+    return ssh_cmd, ssh_pass, target
+
+def build_tmux_command(commands):
+    """
+    Build a tmux command running each SSH command in its own pane.
+
+    Opens a new window when already running inside tmux, a new session otherwise.
+    Passwords are never put on the tmux command line (visible in ps), each one is written
+    to a private temporary file (in $XDG_RUNTIME_DIR/ansible-ssh if available, a tmpfs cleared
+    at logout) which the pane reads into SSHPASS and removes before running sshpass.
+    tmux is then run by a shell which removes the files if tmux fails (e.g. without a terminal),
+    as no pane would remove them then.
+
+    Args:
+        commands (list): (ssh_cmd, ssh_pass) tuples, ssh_pass may be None.
+
+    Returns:
+        tuple: (command, list of password files to remove if the command cannot be executed).
+    """
+    import shlex
+    import tempfile
+
+    password_dir = None
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        password_dir = os.path.join(os.environ["XDG_RUNTIME_DIR"], "ansible-ssh")
+        try:
+            os.makedirs(password_dir, mode=0o700, exist_ok=True)
+        except OSError:
+            password_dir = None
+
+    # Read the password, remove the file and replace the shell with the "sshpass -e ..." command
+    read_password = 'IFS= read -r SSHPASS < "$1"; rm -f "$1"; export SSHPASS; shift; exec "$@"'
+    tmux_cmd = ["tmux", "new-window" if os.environ.get("TMUX") else "new-session"]
+    password_files = []
+    for i, (ssh_cmd, ssh_pass) in enumerate(commands):
+        if i > 0:
+            tmux_cmd.extend([";", "split-window"])
+        if ssh_pass:
+            # mkstemp creates the file readable by the current user only
+            fd, password_file = tempfile.mkstemp(prefix="ansible-ssh-", dir=password_dir)
+            password_files.append(password_file)
+            with os.fdopen(fd, "w") as f:
+                f.write(ssh_pass + "\n")
+            ssh_cmd = ["sh", "-c", read_password, "sh", password_file] + ssh_cmd
+        tmux_cmd.append(shlex.join(ssh_cmd))
+        # Re-tile after every pane, otherwise tmux runs out of space for new panes
+        tmux_cmd.extend([";", "select-layout", "tiled"])
+    if password_files:
+        cleanup = 'tmux "$@" || {{ status=$?; rm -f {}; exit $status; }}'.format(shlex.join(password_files))
+        tmux_cmd = ["sh", "-c", cleanup, "sh"] + tmux_cmd[1:]
+    return tmux_cmd, password_files
+
+def main():
+    """
+    Main entry point for ansible-ssh.
+
+    Parses arguments, retrieves host variables, builds the SSH command,
+    and replaces the current process with SSH (using sshpass if a password is provided).
+    Multiple hosts are opened in tmux panes.
+    If the --print-only flag is provided, prints the SSH command instead of executing it.
+    """
+    # Fast path for printing the completion script, skips building the argument parser.
+    if sys.argv[1:3] in (["-C", "bash"], ["--complete", "bash"]):
+        print_bash_completion_script()
+        sys.exit(0)
+
+    args = parse_arguments()
+
+    # If --complete bash is requested, print the completion script and exit.
+    if args.complete:
+        if args.complete == "bash":
+            print_bash_completion_script()
+            sys.exit(0)
+
+    # Check that the inventory file exists and is accessible.
+    try:
+        inventory_stat = os.stat(args.inventory)
+    except FileNotFoundError:
+        print(f"Error: Inventory file '{args.inventory}' does not exist.", file=sys.stderr)
+        sys.exit(1)
+    except PermissionError:
+        print(f"Error: Permission denied accessing inventory file '{args.inventory}'.", file=sys.stderr)
+        sys.exit(1)
+    except OSError as e:
+        print(f"Error: Cannot access inventory file '{args.inventory}': {e.strerror}", file=sys.stderr)
+        sys.exit(1)
+    # os.stat() only needs search permission on the parent directories, not read permission on the file
+    if not os.access(args.inventory, os.R_OK):
+        print(f"Error: Permission denied accessing inventory file '{args.inventory}'.", file=sys.stderr)
+        sys.exit(1)
+
+    # Get host variables of all hosts with a single inventory lookup.
+    all_host_vars = get_many_host_vars(args.inventory, args.hosts, inventory_stat)
+
+    commands = []
+    for host in args.hosts:
+        # Build the SSH command and extract SSH password if any.
+        ssh_cmd, ssh_pass, target = build_ssh_command(all_host_vars[host], host)
+        # ansible-inventory returns vault encrypted values as {"__ansible_vault": "..."}
+        if ssh_pass is not None and not isinstance(ssh_pass, str):
+            print(f"Error: Vault encrypted SSH password of host '{host}' is not supported.", file=sys.stderr)
+            sys.exit(1)
+
+        # Insert the verbosity flags after "ssh"
+        if args.debug > 0:
+            debug_flags = ["-v"] * min(args.debug, 3)
+            ssh_cmd[1:1] = debug_flags
+            print("Connecting to {} with options: {}".format(target, " ".join(ssh_cmd[1:-1])))
+
+        # If a password is provided, prepend sshpass to the command.
+        # The password is passed in the SSHPASS environment variable, not on the command line (visible in ps).
+        if ssh_pass:
+            if not which("sshpass"):
+                print("Error: sshpass is required for password-based SSH. Please install sshpass.", file=sys.stderr)
+                sys.exit(1)
+            ssh_cmd = ["sshpass", "-e"] + ssh_cmd
+        commands.append((ssh_cmd, ssh_pass))
+
+    # If --print-only flag is provided, just print the SSH command instead of executing it.
+    if args.print_only:
+        import shlex
+        print("SSH command to be executed:" if len(commands) == 1 else "SSH commands to be executed:")
+        for ssh_cmd, ssh_pass in commands:
+            prefix = f"SSHPASS={shlex.quote(ssh_pass)} " if ssh_pass else ""
+            print(prefix + " ".join(shlex.quote(arg) for arg in ssh_cmd))
+        sys.exit(0)
+
+    # ssh does not create the directory of the ControlPath socket
+    if not os.environ.get("ANSIBLE_SSH_NO_MUX"):
+        try:
+            os.makedirs(os.path.expanduser("~/.ssh"), mode=0o700, exist_ok=True)
+        except OSError as e:
+            print(f"Error: Cannot create ~/.ssh directory: {e.strerror}", file=sys.stderr)
+            sys.exit(1)
+
+    # Multiple hosts are opened in tmux panes, a single host is connected to directly.
+    env = os.environ
+    password_files = []
+    if len(commands) > 1:
+        if not which("tmux"):
+            print("Error: tmux is required for connecting to multiple hosts. Please install tmux.", file=sys.stderr)
+            sys.exit(1)
+        cmd, password_files = build_tmux_command(commands)
+    else:
+        cmd, ssh_pass = commands[0]
+        if ssh_pass:
+            env = {**os.environ, "SSHPASS": ssh_pass}
+
+    # Replace this process with ssh (or sshpass/tmux), no need to keep Python around for the whole session.
+    # Flush first, buffered output (e.g. --debug) would be lost otherwise.
+    # The executable was resolved once already, exec it directly instead of searching $PATH again.
+    executable = which(cmd[0])
+    if not executable:
+        for password_file in password_files:
+            os.unlink(password_file)
+        print(f"Error executing SSH: {cmd[0]} not found. Please install it.", file=sys.stderr)
+        sys.exit(1)
+    sys.stdout.flush()
+    try:
+        os.execve(executable, cmd, env)
+    except OSError as e:
+        for password_file in password_files:
+            os.unlink(password_file)
+        print(f"Error executing SSH: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
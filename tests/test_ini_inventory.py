@@ -0,0 +1,126 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from ssh_ansible.ansible_ssh import get_host_vars_from_ini  # noqa: E402
+
+INVENTORY = """\
+# comment
+[all:vars]
+ansible_user=alluser
+shared=all
+number=22
+
+[web]
+web1 ansible_host=10.0.0.1 shared=host
+web2 ansible_host=10.0.0.2 flag=True list="[1, 2]"
+
+[db]
+db1 ansible_host='10.0.1.1' # inline comment
+
+[prod:children]
+web
+db
+
+[prod:vars]
+shared=prod
+env=prod
+ansible_user=produser
+
+[web:vars]
+shared=web
+ansible_user=webuser
+
+[ungrouped]
+lonely
+"""
+
+
+def ansible_inventory_host(inventory_file, host):
+    result = subprocess.run(
+        ["ansible-inventory", "-i", inventory_file, "--host", host],
+        stdin=subprocess.DEVNULL, capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(inventory_file),
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.fixture
+def inventory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Ignore any user/system ansible.cfg
+    (tmp_path / "ansible.cfg").write_text("")
+    monkeypatch.setenv("ANSIBLE_CONFIG", str(tmp_path / "ansible.cfg"))
+    path = tmp_path / "hosts"
+    path.write_text(INVENTORY)
+    return str(path)
+
+
+@pytest.mark.skipif(not shutil.which("ansible-inventory"), reason="ansible-inventory not installed")
+@pytest.mark.parametrize("host", ["web1", "web2", "db1", "lonely"])
+def test_matches_ansible_inventory(inventory, host):
+    assert get_host_vars_from_ini(inventory, [host])[host] == ansible_inventory_host(inventory, host)
+
+
+def test_precedence(inventory):
+    all_host_vars = get_host_vars_from_ini(inventory, ["web1", "db1", "lonely"])
+    assert all_host_vars["web1"]["shared"] == "host"
+    assert all_host_vars["web1"]["ansible_user"] == "webuser"
+    assert all_host_vars["web1"]["env"] == "prod"
+    assert all_host_vars["db1"]["ansible_user"] == "produser"
+    assert all_host_vars["lonely"]["ansible_user"] == "alluser"
+
+
+def test_many_hosts(inventory):
+    all_host_vars = get_host_vars_from_ini(inventory, ["web1", "web2", "db1", "lonely"])
+    for host in ("web1", "web2", "db1", "lonely"):
+        assert all_host_vars[host] == get_host_vars_from_ini(inventory, [host])[host]
+
+
+def test_unknown_host(inventory):
+    assert get_host_vars_from_ini(inventory, ["missing"]) == {}
+    assert set(get_host_vars_from_ini(inventory, ["web1", "missing"])) == {"web1"}
+
+
+@pytest.mark.parametrize("vars_dir", ["group_vars", "host_vars"])
+def test_vars_dir_next_to_inventory(tmp_path, monkeypatch, vars_dir):
+    inventory_dir = tmp_path / "inventory"
+    inventory_dir.mkdir()
+    (inventory_dir / vars_dir).mkdir()
+    (inventory_dir / "hosts").write_text(INVENTORY)
+    monkeypatch.chdir(tmp_path)
+    assert get_host_vars_from_ini(str(inventory_dir / "hosts"), ["web1"]) is None
+
+
+@pytest.mark.parametrize("vars_dir", ["group_vars", "host_vars"])
+def test_vars_dir_in_cwd(inventory, tmp_path, monkeypatch, vars_dir):
+    playbook_dir = tmp_path / "playbooks"
+    (playbook_dir / vars_dir).mkdir(parents=True)
+    monkeypatch.chdir(playbook_dir)
+    assert get_host_vars_from_ini(inventory, ["web1"]) is None
+
+
+@pytest.mark.parametrize("content", [
+    "[web]\nweb[1:3]\n",
+    "[web]\nweb1:2222\n",
+    "[web:unknown]\nweb1\n",
+    "web1 ansible_host=10.0.0.1\n",
+])
+def test_unsupported(tmp_path, monkeypatch, content):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "hosts"
+    path.write_text(content)
+    assert get_host_vars_from_ini(str(path), ["web1"]) is None
+
+
+def test_yaml_inventory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "hosts.yml"
+    path.write_text(INVENTORY)
+    assert get_host_vars_from_ini(str(path), ["web1"]) is None